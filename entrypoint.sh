@@ -13,7 +13,7 @@ fi
 # Keep container running and tail logs
 echo "Container started. Sync scheduled every hour."
 echo "Logs will be available in /app/logs/sync.log"
-echo "Cache file: /app/logs/sync_cache.json"
+echo "Cache database: /app/logs/sync_cache.db"
 echo "Current time: $(date)"
 
 # Create initial log file if it doesn't exist
@@ -1,14 +1,55 @@
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import xml.etree.ElementTree as ET
 from dotenv import load_dotenv
 import os
-import json
+import io
+import sys
+import logging
+import orjson
+import sqlite3
 from datetime import datetime, timedelta
-import hashlib
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
+from urllib.parse import quote_plus
+from email.utils import parsedate_to_datetime
 
 # Load environment variables from .env file
 load_dotenv()
 
+class BufferedStreamHandler(logging.StreamHandler):
+    """StreamHandler that leaves flushing to flush_logs() instead of flushing every record"""
+    def emit(self, record):
+        try:
+            self.stream.write(self.format(record) + self.terminator)
+        except Exception:
+            self.handleError(record)
+
+# Log plain messages to stdout; the handler lock keeps lines from parallel items intact
+logger = logging.getLogger("plex_to_arr")
+_log_handler = BufferedStreamHandler(sys.stdout)
+_log_handler.setFormatter(logging.Formatter("%(message)s"))
+logger.addHandler(_log_handler)
+logger.propagate = False
+
+# e.g. WARNING to only log problems; unknown names fall back to INFO
+_log_level = os.getenv("LOG_LEVEL", "INFO").upper()
+if isinstance(logging.getLevelName(_log_level), int):
+    logger.setLevel(_log_level)
+else:
+    logger.setLevel(logging.INFO)
+    logger.warning(f"⚠️  Unknown LOG_LEVEL '{_log_level}', using INFO")
+
+# Curl commands and dry-run previews are the requested output, so they ignore LOG_LEVEL
+report_logger = logger.getChild("report")
+report_logger.setLevel(logging.INFO)
+
+def flush_logs():
+    """Write out buffered log lines, called at checkpoints in main"""
+    _log_handler.flush()
+
 # Retrieve API keys from environment variables
 PLEX_TOKEN = os.getenv("PLEX_TOKEN")
 RADARR_API_KEY = os.getenv("RADARR_API_KEY")
@@ -24,111 +65,239 @@ SONARR_URL = os.getenv("SONARR_URL", "http://localhost:8989/api/v3")
 RADARR_ROOT_FOLDER = "/config/Downloads/complete/Filme"
 SONARR_ROOT_FOLDER = "/config/Downloads/complete/Serien"
 
+# Request headers per service, built once and shared by every call (never mutated)
+RADARR_HEADERS = {"X-Api-Key": RADARR_API_KEY, "Content-Type": "application/json", "Accept": "application/json"}
+SONARR_HEADERS = {"X-Api-Key": SONARR_API_KEY, "Content-Type": "application/json", "Accept": "application/json"}
+TMDB_HEADERS = {"Accept": "application/json"}
+
 # Language Profile ID for Sonarr
 LANGUAGE_PROFILE = 1  # Adjust this value based on your Sonarr configuration
 
+# Static parts of the add payloads, merged with the per-item fields on each call
+_RADARR_PAYLOAD_TEMPLATE = {
+    "qualityProfileId": RADARR_QUALITY_PROFILE,
+    "rootFolderPath": RADARR_ROOT_FOLDER,
+    "monitored": True,
+    "addOptions": {
+        "searchForMovie": True
+    }
+}
+_SONARR_PAYLOAD_TEMPLATE = {
+    "qualityProfileId": SONARR_QUALITY_PROFILE,
+    "languageProfileId": LANGUAGE_PROFILE,
+    "rootFolderPath": SONARR_ROOT_FOLDER,
+    "monitored": True,
+    "addOptions": {
+        "searchForMissingEpisodes": True
+    }
+}
+
 # Cache settings
-CACHE_FILE = "/app/logs/sync_cache.json"
+CACHE_DB = "/app/logs/sync_cache.db"
+CACHE_FILE = "/app/logs/sync_cache.json"  # Legacy JSON cache, imported once into CACHE_DB
 CACHE_REFRESH_HOURS = int(os.getenv("CACHE_REFRESH_HOURS", "24"))  # Refresh cache daily
+CACHE_LOCK = threading.Lock()  # Guards cache mutation from worker threads
+CACHE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS synced(key TEXT PRIMARY KEY, title TEXT, media_type TEXT, year INTEGER, target TEXT, synced_at TEXT);
+CREATE TABLE IF NOT EXISTS tmdb_ids(key TEXT PRIMARY KEY, tmdb_id INTEGER);
+CREATE TABLE IF NOT EXISTS meta(key TEXT PRIMARY KEY, value TEXT);
+"""
+
+# Concurrency settings
+MAX_WORKERS = int(os.getenv("MAX_WORKERS", "8"))  # Watchlist items processed in parallel
+
+# TMDB rate limiting
+TMDB_SEMAPHORE = threading.BoundedSemaphore(20)  # Max TMDB lookups in flight
+TMDB_RATE_LIMIT_THRESHOLD = 2  # Pause when fewer requests than this remain in the window
+TMDB_RATE_LIMIT_LOCK = threading.Lock()
+_tmdb_resume_at = 0.0  # time.monotonic() before which no TMDB call is made
+TMDB_LOOKUPS = {}  # tmdb_ids key -> Future of the lookup currently in flight for it
+TMDB_LOOKUPS_LOCK = threading.Lock()
 
 # Plex settings
 FETCH_ALL_USER_WATCHLISTS = os.getenv("FETCH_ALL_USER_WATCHLISTS", "false").lower() == "true"
+PLEX_HEADERS = {"X-Plex-Token": PLEX_TOKEN, "Accept": "application/xml"}  # Plex answers with JSON if asked, the parser expects XML
+
+# Shared HTTP session so every call reuses pooled keep-alive connections
+SESSION = requests.Session()
+_retry = Retry(total=3, backoff_factor=0.5, status_forcelist=[429, 500, 502, 503, 504], raise_on_status=False)
+# Keep at least one pooled connection per worker so raising MAX_WORKERS never
+# discards sockets and forces fresh TCP/TLS handshakes
+_adapter = HTTPAdapter(pool_connections=4, pool_maxsize=max(32, MAX_WORKERS), max_retries=_retry)
+SESSION.mount("http://", _adapter)
+SESSION.mount("https://", _adapter)
+SESSION.headers.update({"Accept": "application/json"})
+
+def open_cache_db(path):
+    """Connect to a cache database and make sure its schema exists"""
+    db = sqlite3.connect(path, isolation_level=None, check_same_thread=False)
+    try:
+        db.execute("PRAGMA journal_mode=WAL")
+        db.execute("PRAGMA synchronous=NORMAL")
+        db.executescript(CACHE_SCHEMA)
+    except Exception:
+        db.close()
+        raise
+    return db
 
 def load_sync_cache():
-    """Load the sync cache from disk"""
+    """Open the sync cache database, creating or expiring it as needed"""
+    is_new = True
     try:
+        os.makedirs(os.path.dirname(CACHE_DB), exist_ok=True)
+        is_new = not os.path.exists(CACHE_DB)
+        db = open_cache_db(CACHE_DB)
+    except sqlite3.DatabaseError as e:
+        logger.warning(f"⚠️  Cache database is unreadable ({e}), moving it aside and creating a new one")
+        is_new = True
+        try:
+            os.replace(CACHE_DB, CACHE_DB + ".corrupt")
+            for suffix in ("-wal", "-shm"):
+                if os.path.exists(CACHE_DB + suffix):
+                    os.remove(CACHE_DB + suffix)
+            db = open_cache_db(CACHE_DB)
+        except Exception as e:
+            logger.warning(f"⚠️  Error recreating cache: {e}, using a temporary in-memory cache")
+            db = open_cache_db(":memory:")
+    except Exception as e:
+        logger.warning(f"⚠️  Error opening cache: {e}, using a temporary in-memory cache")
+        db = open_cache_db(":memory:")
+    cache = {'db': db}
+    
+    if is_new:
         if os.path.exists(CACHE_FILE):
-            with open(CACHE_FILE, 'r') as f:
-                cache = json.load(f)
-                # Check if cache needs refresh
-                last_refresh = datetime.fromisoformat(cache.get('last_refresh', '2000-01-01T00:00:00'))
-                if datetime.now() - last_refresh > timedelta(hours=CACHE_REFRESH_HOURS):
-                    print(f"🔄 Cache expired (>{CACHE_REFRESH_HOURS}h old), will refresh from servers")
-                    return {'synced_items': {}, 'last_refresh': datetime.now().isoformat()}
-                return cache
+            import_json_cache(cache)
         else:
-            print("📝 Creating new sync cache")
-            return {'synced_items': {}, 'last_refresh': datetime.now().isoformat()}
+            logger.info("📝 Creating new sync cache")
+            set_cache_meta(cache, 'last_refresh', datetime.now().isoformat())
+    
+    # Check if cache needs refresh
+    last_refresh = datetime.fromisoformat(get_cache_meta(cache, 'last_refresh') or '2000-01-01T00:00:00')
+    if datetime.now() - last_refresh > timedelta(hours=CACHE_REFRESH_HOURS):
+        logger.info(f"🔄 Cache expired (>{CACHE_REFRESH_HOURS}h old), will refresh from servers")
+        # TMDB ids never change, so only the synced items are dropped
+        db.execute("DELETE FROM synced")
+        db.execute("DELETE FROM meta WHERE key LIKE 'synced_watchlist_%'")
+        set_cache_meta(cache, 'last_refresh', datetime.now().isoformat())
+    return cache
+
+def import_json_cache(cache):
+    """Import the JSON cache written by older versions into a new database"""
+    logger.info(f"📦 Importing existing cache from {CACHE_FILE}")
+    try:
+        with open(CACHE_FILE, 'rb') as f:
+            old_cache = orjson.loads(f.read())
+        synced_rows = []
+        for entry in old_cache.get('synced_items', {}).values():
+            # Older versions stored 'Unknown' for items without a year
+            year = None if entry.get('year') == 'Unknown' else entry.get('year')
+            synced_rows.append((get_item_key(entry['title'], entry['media_type'], year), entry['title'],
+                                entry['media_type'], year, entry.get('target_service'), entry.get('synced_at')))
+        db = cache['db']
+        db.execute("BEGIN")
+        db.executemany("INSERT OR IGNORE INTO synced VALUES (?, ?, ?, ?, ?, ?)", synced_rows)
+        db.executemany("INSERT OR IGNORE INTO tmdb_ids VALUES (?, ?)", old_cache.get('tmdb_ids', {}).items())
+        db.execute("COMMIT")
+        set_cache_meta(cache, 'last_refresh', old_cache.get('last_refresh', datetime.now().isoformat()))
     except Exception as e:
-        print(f"⚠️  Error loading cache: {e}, creating new cache")
-        return {'synced_items': {}, 'last_refresh': datetime.now().isoformat()}
+        logger.warning(f"⚠️  Error importing cache: {e}, starting with an empty cache")
+        if cache['db'].in_transaction:
+            cache['db'].execute("ROLLBACK")
+        set_cache_meta(cache, 'last_refresh', datetime.now().isoformat())
 
-def save_sync_cache(cache):
-    """Save the sync cache to disk"""
+def close_sync_cache(cache):
+    """Close the sync cache database"""
     try:
-        os.makedirs(os.path.dirname(CACHE_FILE), exist_ok=True)
-        with open(CACHE_FILE, 'w') as f:
-            json.dump(cache, f, indent=2)
+        cache['db'].close()
     except Exception as e:
-        print(f"⚠️  Error saving cache: {e}")
+        logger.warning(f"⚠️  Error closing cache: {e}")
+
+def get_cache_meta(cache, key):
+    """Read a value from the cache metadata table"""
+    with CACHE_LOCK:
+        row = cache['db'].execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+    return row[0] if row else None
+
+def set_cache_meta(cache, key, value):
+    """Store a value in the cache metadata table"""
+    with CACHE_LOCK:
+        cache['db'].execute("INSERT OR REPLACE INTO meta VALUES (?, ?)", (key, value))
+
+def count_synced_items(cache):
+    """Return the number of items recorded as synced"""
+    with CACHE_LOCK:
+        return cache['db'].execute("SELECT COUNT(*) FROM synced").fetchone()[0]
 
 def get_item_key(title, media_type, year=None):
     """Generate a unique key for a watchlist item"""
-    key_string = f"{title}|{media_type}|{year or 'unknown'}"
-    return hashlib.md5(key_string.encode()).hexdigest()
+    # The plain string is already a unique primary key, no need to hash it
+    return f"{title}|{media_type}|{year or 'unknown'}"
 
-def is_item_synced(cache, title, media_type, year=None):
-    """Check if an item has already been synced"""
-    item_key = get_item_key(title, media_type, year)
-    return item_key in cache['synced_items']
+def get_synced_keys(cache, item_keys):
+    """Return the subset of item_keys that have already been synced"""
+    item_keys = list(item_keys)
+    synced_keys = set()
+    with CACHE_LOCK:
+        # Stay well below SQLite's limit on bound parameters per statement
+        for start in range(0, len(item_keys), 500):
+            chunk = item_keys[start:start + 500]
+            placeholders = ",".join("?" * len(chunk))
+            rows = cache['db'].execute(f"SELECT key FROM synced WHERE key IN ({placeholders})", chunk)
+            synced_keys.update(row[0] for row in rows)
+    return synced_keys
 
-def mark_item_synced(cache, title, media_type, year=None, target_service=None):
+def mark_item_synced(cache, item_key, title, media_type, year=None, target_service=None):
     """Mark an item as successfully synced"""
-    item_key = get_item_key(title, media_type, year)
-    cache['synced_items'][item_key] = {
-        'title': title,
-        'media_type': media_type,
-        'year': year,
-        'target_service': target_service,
-        'synced_at': datetime.now().isoformat()
-    }
+    with CACHE_LOCK:
+        cache['db'].execute(
+            "INSERT OR IGNORE INTO synced VALUES (?, ?, ?, ?, ?, ?)",
+            (item_key, title, media_type, year, target_service, datetime.now().isoformat())
+        )
 
 def refresh_cache_from_servers(cache):
     """Refresh cache by checking what's actually in Radarr/Sonarr"""
-    print("🔄 Refreshing cache from Radarr/Sonarr...")
+    logger.info("🔄 Refreshing cache from Radarr/Sonarr...")
     try:
         # Check Radarr movies
-        headers = {'X-Api-Key': RADARR_API_KEY}
-        response = requests.get(f"{RADARR_URL}/movie", headers=headers, timeout=30)
+        response = SESSION.get(f"{RADARR_URL}/movie", headers=RADARR_HEADERS, timeout=30)
         if response.status_code == 200:
-            movies = response.json()
-            print(f"📽️  Found {len(movies)} movies in Radarr")
+            movies = orjson.loads(response.content)
+            cache['radarr_tmdb_ids'] = {m['tmdbId'] for m in movies if m.get('tmdbId')}
+            logger.info(f"📽️  Found {len(movies)} movies in Radarr")
             
         # Check Sonarr series
-        headers = {'X-Api-Key': SONARR_API_KEY}
-        response = requests.get(f"{SONARR_URL}/series", headers=headers, timeout=30)
+        response = SESSION.get(f"{SONARR_URL}/series", headers=SONARR_HEADERS, timeout=30)
         if response.status_code == 200:
-            series = response.json()
-            print(f"📺 Found {len(series)} series in Sonarr")
+            series = orjson.loads(response.content)
+            cache['sonarr_tvdb_ids'] = {s['tvdbId'] for s in series if s.get('tvdbId')}
+            logger.info(f"📺 Found {len(series)} series in Sonarr")
             
-        # Update cache refresh time
-        cache['last_refresh'] = datetime.now().isoformat()
-        print("✅ Cache refreshed successfully")
+        # last_refresh is left alone: it tracks when synced_items were last reset
+        logger.info("✅ Cache refreshed successfully")
         
     except Exception as e:
-        print(f"⚠️  Error refreshing cache: {e}")
+        logger.warning(f"⚠️  Error refreshing cache: {e}")
         
     return cache
 
 def validate_quality_profiles():
     """Validate that the quality profiles exist and show current settings"""
-    print(f"📋 Quality Profile Settings:")
-    print(f"  🎬 Radarr (Movies): Profile ID {RADARR_QUALITY_PROFILE}")
-    print(f"  📺 Sonarr (TV Shows): Profile ID {SONARR_QUALITY_PROFILE}")
+    logger.info(f"📋 Quality Profile Settings:")
+    logger.info(f"  🎬 Radarr (Movies): Profile ID {RADARR_QUALITY_PROFILE}")
+    logger.info(f"  📺 Sonarr (TV Shows): Profile ID {SONARR_QUALITY_PROFILE}")
     
     # Try to validate Radarr profile
     try:
-        headers = {"X-Api-Key": RADARR_API_KEY}
-        response = requests.get(f"{RADARR_URL}/qualityProfile", timeout=10, headers=headers)
+        response = SESSION.get(f"{RADARR_URL}/qualityProfile", timeout=10, headers=RADARR_HEADERS)
         if response.status_code == 200:
-            profiles = response.json()
+            profiles = orjson.loads(response.content)
             radarr_profile = next((p for p in profiles if p['id'] == RADARR_QUALITY_PROFILE), None)
             if radarr_profile:
-                print(f"  ✅ Radarr Profile: {radarr_profile['name']}")
+                logger.info(f"  ✅ Radarr Profile: {radarr_profile['name']}")
             else:
-                print(f"  ⚠️  Radarr Profile ID {RADARR_QUALITY_PROFILE} not found!")
+                logger.warning(f"  ⚠️  Radarr Profile ID {RADARR_QUALITY_PROFILE} not found!")
     except Exception as e:
-        print(f"  ❌ Could not validate Radarr profile: {e}")
+        logger.error(f"  ❌ Could not validate Radarr profile: {e}")
 
 validate_quality_profiles()
 
@@ -136,8 +305,8 @@ def get_plex_users():
     """Get all users on the Plex server (requires admin token)"""
     try:
         # First try to get users from the server
-        plex_url = f"https://plex.tv/api/users?X-Plex-Token={PLEX_TOKEN}"
-        response = requests.get(plex_url)
+        plex_url = "https://plex.tv/api/users"
+        response = SESSION.get(plex_url, headers=PLEX_HEADERS)
         if response.status_code == 200:
             root = ET.fromstring(response.content)
             users = []
@@ -147,36 +316,63 @@ def get_plex_users():
                 users.append({'id': user_id, 'username': username})
             return users
         else:
-            print(f"⚠️  Could not fetch users (status: {response.status_code}), using token owner only")
+            logger.warning(f"⚠️  Could not fetch users (status: {response.status_code}), using token owner only")
             return None
     except Exception as e:
-        print(f"⚠️  Error fetching users: {e}, using token owner only")
+        logger.warning(f"⚠️  Error fetching users: {e}, using token owner only")
         return None
 
 def fetch_user_watchlist(user_id=None):
     """Fetch watchlist for a specific user or token owner"""
     if user_id:
-        plex_url = f"https://metadata.provider.plex.tv/library/sections/watchlist/all?X-Plex-Token={PLEX_TOKEN}&X-Plex-Container-Start=0&X-Plex-Container-Size=100&userID={user_id}"
+        plex_url = f"https://metadata.provider.plex.tv/library/sections/watchlist/all?X-Plex-Container-Start=0&X-Plex-Container-Size=100&userID={user_id}"
     else:
-        plex_url = f"https://metadata.provider.plex.tv/library/sections/watchlist/all?X-Plex-Token={PLEX_TOKEN}"
+        plex_url = "https://metadata.provider.plex.tv/library/sections/watchlist/all"
     
     try:
-        response = requests.get(plex_url)
+        response = SESSION.get(plex_url, headers=PLEX_HEADERS)
         if response.status_code == 200:
-            root = ET.fromstring(response.content)
-            items = root.findall('Directory') + root.findall('Video')
+            # Stream the XML and keep only the attributes we use instead of the whole tree
+            items = []
+            root = None
+            for event, elem in ET.iterparse(io.BytesIO(response.content), events=('start', 'end')):
+                if root is None:
+                    root = elem
+                elif event == 'end' and elem.tag in ('Directory', 'Video'):
+                    items.append({'title': elem.get('title'), 'type': elem.get('type'), 'year': elem.get('year')})
+                    # Drop finished items from the root so the tree never grows
+                    root.clear()
             return items
         else:
-            print(f"⚠️  Failed to fetch watchlist (status: {response.status_code})")
+            logger.warning(f"⚠️  Failed to fetch watchlist (status: {response.status_code})")
             return []
     except Exception as e:
-        print(f"⚠️  Error fetching watchlist: {e}")
+        logger.warning(f"⚠️  Error fetching watchlist: {e}")
         return []
 
+def fetch_watchlist_signature():
+    """Return 'totalSize|newest item' for the token owner's watchlist, fetching only one item"""
+    # Newest first, so adding a title changes the signature even when another was removed
+    plex_url = ("https://metadata.provider.plex.tv/library/sections/watchlist/all"
+                "?X-Plex-Container-Start=0&X-Plex-Container-Size=1&sort=watchlistedAt:desc")
+    try:
+        response = SESSION.get(plex_url, headers=PLEX_HEADERS, timeout=30)
+        if response.status_code == 200:
+            root = ET.fromstring(response.content)
+            total_size = root.get('totalSize')
+            if total_size is None:
+                return None
+            newest = next((elem for elem in root if elem.tag in ('Directory', 'Video')), None)
+            newest_id = (newest.get('ratingKey') or newest.get('guid') or '') if newest is not None else ''
+            return f"{total_size}|{newest_id}"
+    except Exception as e:
+        logger.warning(f"⚠️  Error fetching watchlist signature: {e}")
+    return None
+
 def fetch_plex_watchlist():
     """Fetch Plex watchlist(s) - single user or all users based on settings"""
     if FETCH_ALL_USER_WATCHLISTS:
-        print("🔍 Fetching watchlists from ALL Plex users...")
+        logger.info("🔍 Fetching watchlists from ALL Plex users...")
         users = get_plex_users()
         
         if users:
@@ -184,7 +380,7 @@ def fetch_plex_watchlist():
             processed_titles = set()  # Avoid duplicates across users
             
             for user in users:
-                print(f"  📋 Fetching watchlist for user: {user['username']}")
+                logger.info(f"  📋 Fetching watchlist for user: {user['username']}")
                 user_items = fetch_user_watchlist(user['id'])
                 
                 # Filter out duplicates based on title
@@ -194,225 +390,245 @@ def fetch_plex_watchlist():
                         all_items.append(item)
                         processed_titles.add(title)
                 
-                print(f"    ✅ Found {len(user_items)} items ({len([i for i in user_items if i.get('title') not in processed_titles])} new)")
+                logger.info(f"    ✅ Found {len(user_items)} items ({len([i for i in user_items if i.get('title') not in processed_titles])} new)")
             
-            print(f"📋 Total unique items from all users: {len(all_items)}")
+            logger.info(f"📋 Total unique items from all users: {len(all_items)}")
             return all_items
         else:
-            print("⚠️  Could not fetch user list, falling back to token owner only")
+            logger.warning("⚠️  Could not fetch user list, falling back to token owner only")
             return fetch_user_watchlist()
     else:
-        print("📋 Fetching Plex watchlist for token owner...")
+        logger.info("📋 Fetching Plex watchlist for token owner...")
         return fetch_user_watchlist()
 
+def wait_for_tmdb_rate_limit():
+    """Sleep until any back-off requested by an earlier TMDB response has passed"""
+    delay = _tmdb_resume_at - time.monotonic()
+    if delay > 0:
+        time.sleep(delay)
+
+def parse_retry_after(value, default=1.0):
+    """Turn a Retry-After header (seconds or HTTP-date) into a delay in seconds"""
+    if value:
+        try:
+            return max(float(value), 0.0)
+        except ValueError:
+            pass
+        try:
+            retry_at = parsedate_to_datetime(value)
+            return max((retry_at - datetime.now(retry_at.tzinfo)).total_seconds(), 0.0)
+        except (TypeError, ValueError):
+            pass
+    return default
+
+def track_tmdb_rate_limit(response):
+    """Push back further TMDB calls when a response says the rate limit is (nearly) used up"""
+    global _tmdb_resume_at
+    remaining = response.headers.get('X-RateLimit-Remaining', '')
+    # A missing or non-numeric header counts as "no limit reported"
+    if response.status_code != 429 and (not remaining.isdigit() or int(remaining) >= TMDB_RATE_LIMIT_THRESHOLD):
+        return
+    backoff = parse_retry_after(response.headers.get('Retry-After'))
+    with TMDB_RATE_LIMIT_LOCK:
+        _tmdb_resume_at = max(_tmdb_resume_at, time.monotonic() + backoff)
+
 def fetch_tmdb_id(title, media_type):
-    if media_type == "show":
-        search_url = f"https://api.themoviedb.org/3/search/tv?api_key={TMDB_API_KEY}&query={title}"
-    else:
-        search_url = f"https://api.themoviedb.org/3/search/movie?api_key={TMDB_API_KEY}&query={title}"
-    response = requests.get(search_url)
+    search_url = "https://api.themoviedb.org/3/search/" + ("tv" if media_type == "show" else "movie")
+    # Let requests encode the title, raw '&' or '#' would cut the query short
+    params = {"api_key": TMDB_API_KEY, "query": title.strip()}
+    with TMDB_SEMAPHORE:
+        wait_for_tmdb_rate_limit()
+        response = SESSION.get(search_url, params=params, headers=TMDB_HEADERS, timeout=10)
+        track_tmdb_rate_limit(response)
     if response.status_code == 200:
-        results = response.json().get('results')
+        results = orjson.loads(response.content).get('results')
         if results:
             # Assuming the first result is the most relevant one
             return results[0]['id']
         else:
-            print(f"No TMDB ID found for {media_type} '{title}'")
+            logger.warning(f"No TMDB ID found for {media_type} '{title}'")
             return None
     else:
-        print(f"Failed to retrieve TMDB ID for {media_type} '{title}'")
+        logger.warning(f"Failed to retrieve TMDB ID for {media_type} '{title}'")
         return None
 
-def add_to_radarr(tmdb_id, title):
-    print(f"Adding movie '{title}' to Radarr...")
-    payload = {
-        "title": title,
-        "qualityProfileId": int(RADARR_QUALITY_PROFILE),
-        "tmdbId": tmdb_id,
-        "rootFolderPath": RADARR_ROOT_FOLDER,
-        "monitored": True,
-        "addOptions": {
-            "searchForMovie": True
-        }
-    }
-    
-    headers = {"X-Api-Key": RADARR_API_KEY, "Content-Type": "application/json"}
-    radarr_add_url = f"{RADARR_URL}/movie"
-    
+def fetch_tmdb_id_cached(title, media_type, cache):
+    """Look up a TMDB ID, only querying TMDB for titles not seen before"""
+    tmdb_key = f"{media_type}:{title.strip().lower()}"
+    with CACHE_LOCK:
+        row = cache['db'].execute("SELECT tmdb_id FROM tmdb_ids WHERE key = ?", (tmdb_key,)).fetchone()
+    if row:
+        return row[0]
+    # Workers looking up the same title at once share a single TMDB request
+    with TMDB_LOOKUPS_LOCK:
+        lookup = TMDB_LOOKUPS.get(tmdb_key)
+        owner = lookup is None
+        if owner:
+            lookup = TMDB_LOOKUPS[tmdb_key] = Future()
+    if not owner:
+        return lookup.result()
     try:
-        response = requests.post(radarr_add_url, json=payload, headers=headers, timeout=30)
-        if response.status_code == 201:
-            print(f"✅ Added movie '{title}' to Radarr successfully.")
-        elif response.status_code == 400:
-            try:
-                error_data = response.json()
-                if isinstance(error_data, list) and error_data:
-                    error_message = error_data[0].get('errorMessage', 'Unknown error')
-                else:
-                    error_message = str(error_data)
-                print(f"⚠️  Movie '{title}' not added: {error_message}")
-            except:
-                print(f"⚠️  Movie '{title}' not added: {response.text[:100]}")
-        else:
-            print(f"❌ Failed to add movie '{title}'. Status Code: {response.status_code}")
-            print(f"Response: {response.text[:200]}")
-    except Exception as e:
-        print(f"❌ Error adding movie '{title}': {e}")
-
-def add_to_radarr_with_cache(tmdb_id, title, cache, media_type, year):
-    """Add movie to Radarr and update cache on success"""
-    print(f"Adding movie '{title}' to Radarr...")
-    payload = {
-        "title": title,
-        "qualityProfileId": int(RADARR_QUALITY_PROFILE),
-        "tmdbId": tmdb_id,
-        "rootFolderPath": RADARR_ROOT_FOLDER,
-        "monitored": True,
-        "addOptions": {
-            "searchForMovie": True
-        }
-    }
+        # The previous owner may have stored the ID between our miss and taking the lookup
+        with CACHE_LOCK:
+            row = cache['db'].execute("SELECT tmdb_id FROM tmdb_ids WHERE key = ?", (tmdb_key,)).fetchone()
+        tmdb_id = row[0] if row else fetch_tmdb_id(title, media_type)
+        if tmdb_id is not None and not row:
+            with CACHE_LOCK:
+                cache['db'].execute("INSERT OR REPLACE INTO tmdb_ids VALUES (?, ?)", (tmdb_key, tmdb_id))
+        lookup.set_result(tmdb_id)
+        return tmdb_id
+    except BaseException as e:
+        lookup.set_exception(e)
+        raise
+    finally:
+        with TMDB_LOOKUPS_LOCK:
+            del TMDB_LOOKUPS[tmdb_key]
+
+def add_to_radarr(tmdb_id, title, cache=None, item_key=None, media_type=None, year=None):
+    """Add movie to Radarr, updating the cache on success when one is given"""
+    logger.info(f"Adding movie '{title}' to Radarr...")
+    payload = {**_RADARR_PAYLOAD_TEMPLATE, "title": title, "tmdbId": tmdb_id}
     
-    headers = {"X-Api-Key": RADARR_API_KEY, "Content-Type": "application/json"}
     radarr_add_url = f"{RADARR_URL}/movie"
     
     try:
-        response = requests.post(radarr_add_url, json=payload, headers=headers, timeout=30)
+        response = SESSION.post(radarr_add_url, json=payload, headers=RADARR_HEADERS, timeout=30)
         if response.status_code == 201:
-            print(f"✅ Added movie '{title}' to Radarr successfully.")
-            mark_item_synced(cache, title, media_type, year, 'radarr')
+            logger.info(f"✅ Added movie '{title}' to Radarr successfully.")
+            if cache is not None:
+                mark_item_synced(cache, item_key, title, media_type, year, 'radarr')
             return True
         elif response.status_code == 400:
             try:
-                error_data = response.json()
+                error_data = orjson.loads(response.content)
                 if isinstance(error_data, list) and error_data:
                     error_message = error_data[0].get('errorMessage', 'Unknown error')
                     if 'already been added' in error_message:
-                        print(f"✅ Movie '{title}' already exists in Radarr")
-                        mark_item_synced(cache, title, media_type, year, 'radarr')
+                        logger.info(f"✅ Movie '{title}' already exists in Radarr")
+                        if cache is not None:
+                            mark_item_synced(cache, item_key, title, media_type, year, 'radarr')
                         return True
                 else:
                     error_message = str(error_data)
-                print(f"⚠️  Movie '{title}' not added: {error_message}")
+                logger.warning(f"⚠️  Movie '{title}' not added: {error_message}")
             except:
-                print(f"⚠️  Movie '{title}' not added: {response.text[:100]}")
+                logger.warning(f"⚠️  Movie '{title}' not added: {response.text[:100]}")
         else:
-            print(f"❌ Failed to add movie '{title}'. Status Code: {response.status_code}")
-            print(f"Response: {response.text[:200]}")
+            logger.error(f"❌ Failed to add movie '{title}'. Status Code: {response.status_code}")
+            logger.error(f"Response: {response.text[:200]}")
     except Exception as e:
-        print(f"❌ Error adding movie '{title}': {e}")
+        logger.error(f"❌ Error adding movie '{title}': {e}")
     
     return False
 
-def add_to_sonarr(tmdb_id, title):
-    print(f"Adding series '{title}' to Sonarr...")
-    payload = {
-        "title": title,
-        "qualityProfileId": int(SONARR_QUALITY_PROFILE),
-        "languageProfileId": int(LANGUAGE_PROFILE),
-        "tvdbId": tmdb_id,
-        "rootFolderPath": SONARR_ROOT_FOLDER,
-        "monitored": True,
-        "addOptions": {
-            "searchForMissingEpisodes": True
-        }
-    }
-    sonarr_add_url = f"{SONARR_URL}/series?apikey={SONARR_API_KEY}"
-    response = requests.post(sonarr_add_url, json=payload)
-    if response.status_code == 201:
-        print(f"Added series '{title}' to Sonarr successfully.")
-    else:
-        try:
-            error_message = response.json()[0]['errorMessage']
-            print(f"Failed to add series '{title}' to Sonarr. Error: {error_message}")
-        except (KeyError, IndexError):
-            print(f"Failed to add series '{title}' to Sonarr. Status Code: {response.status_code}")
-
-def search_and_add_series(search_term):
+def search_and_add_series(search_term, cache=None, item_key=None, media_type=None, year=None):
+    """Search and add series to Sonarr, updating the cache on success when one is given"""
     search_url = f"{SONARR_URL}/series/lookup"
-    headers = {"X-Api-Key": SONARR_API_KEY}
     params = {"term": search_term}
     
-    response = requests.get(search_url, headers=headers, params=params)
+    response = SESSION.get(search_url, headers=SONARR_HEADERS, params=params)
     if response.status_code == 200:
-        results = response.json()
-        if results:
-            series = results[0]  # Assuming the first search result is the desired series
-            series_id = series["tvdbId"]
-            add_series_url = f"{SONARR_URL}/series"
-            payload = {
-                "title": series["title"],
-                "qualityProfileId": int(SONARR_QUALITY_PROFILE),
-                "languageProfileId": int(LANGUAGE_PROFILE),
-                "tvdbId": series_id,
-                "rootFolderPath": SONARR_ROOT_FOLDER,
-                "monitored": True,
-                "addOptions": {
-                    "searchForMissingEpisodes": True
-                }
-            }
-            
-            response = requests.post(add_series_url, headers=headers, json=payload)
-            if response.status_code == 201:
-                print(f"Added series '{series['title']}' to Sonarr successfully.")
-            else:
-                try:
-                    error_message = response.json()[0]['errorMessage']
-                    print(f"Failed to add series '{series['title']}' to Sonarr. Error: {error_message}")
-                except (KeyError, IndexError):
-                    print(f"Failed to add series '{series['title']}' to Sonarr. Status Code: {response.status_code}")
-        else:
-            print("No series found for the search term.")
-    else:
-        print("Failed to perform series search.")
-
-def search_and_add_series_with_cache(search_term, cache, media_type, year):
-    """Search and add series to Sonarr with cache tracking"""
-    search_url = f"{SONARR_URL}/series/lookup"
-    headers = {"X-Api-Key": SONARR_API_KEY}
-    params = {"term": search_term}
-    
-    response = requests.get(search_url, headers=headers, params=params)
-    if response.status_code == 200:
-        results = response.json()
+        results = orjson.loads(response.content)
         if results:
             series = results[0]  # Assuming the first search result is the desired series
             series_id = series["tvdbId"]
+            if cache is not None and series_id in cache.get('sonarr_tvdb_ids', ()):
+                logger.info(f"✅ Series '{search_term}' already exists in Sonarr")
+                mark_item_synced(cache, item_key, search_term, media_type, year, 'sonarr')
+                return True
             add_series_url = f"{SONARR_URL}/series"
-            payload = {
-                "title": series["title"],
-                "qualityProfileId": int(SONARR_QUALITY_PROFILE),
-                "languageProfileId": int(LANGUAGE_PROFILE),
-                "tvdbId": series_id,
-                "rootFolderPath": SONARR_ROOT_FOLDER,
-                "monitored": True,
-                "addOptions": {
-                    "searchForMissingEpisodes": True
-                }
-            }
+            payload = {**_SONARR_PAYLOAD_TEMPLATE, "title": series["title"], "tvdbId": series_id}
             
-            response = requests.post(add_series_url, headers=headers, json=payload)
+            response = SESSION.post(add_series_url, headers=SONARR_HEADERS, json=payload)
             if response.status_code == 201:
-                print(f"✅ Added series '{series['title']}' to Sonarr successfully.")
-                mark_item_synced(cache, search_term, media_type, year, 'sonarr')
+                logger.info(f"✅ Added series '{series['title']}' to Sonarr successfully.")
+                if cache is not None:
+                    mark_item_synced(cache, item_key, search_term, media_type, year, 'sonarr')
                 return True
             else:
                 try:
-                    error_message = response.json()[0]['errorMessage']
+                    error_message = orjson.loads(response.content)[0]['errorMessage']
                     if 'already been added' in error_message:
-                        print(f"✅ Series '{search_term}' already exists in Sonarr")
-                        mark_item_synced(cache, search_term, media_type, year, 'sonarr')
+                        logger.info(f"✅ Series '{search_term}' already exists in Sonarr")
+                        if cache is not None:
+                            mark_item_synced(cache, item_key, search_term, media_type, year, 'sonarr')
                         return True
-                    print(f"⚠️  Failed to add series '{series['title']}' to Sonarr. Error: {error_message}")
+                    logger.warning(f"⚠️  Failed to add series '{series['title']}' to Sonarr. Error: {error_message}")
                 except (KeyError, IndexError):
-                    print(f"❌ Failed to add series '{series['title']}' to Sonarr. Status Code: {response.status_code}")
+                    logger.error(f"❌ Failed to add series '{series['title']}' to Sonarr. Status Code: {response.status_code}")
         else:
-            print("❌ No series found for the search term.")
+            logger.error("❌ No series found for the search term.")
     else:
-        print("❌ Failed to perform series search.")
+        logger.error("❌ Failed to perform series search.")
     
     return False
 
+def process_item(index, total, item_key, item, cache, dry_run, generate_curl):
+    """Sync a single watchlist item, returning True if it was newly synced"""
+    title = item.get('title')
+    media_type = item.get('type')
+    year = item.get('year')
+    
+    logger.info(f"\n[{index}/{total}] 📺 {title} ({year or 'Unknown'}) - Type: {media_type}")
+    
+    if media_type == "movie":
+        tmdb_id = fetch_tmdb_id_cached(title, media_type, cache)
+        if tmdb_id is None:
+            logger.warning(f"⚠️  Could not find TMDB ID for movie: {title}")
+            return False
+        if tmdb_id in cache.get('radarr_tmdb_ids', ()):
+            logger.info(f"✅ Movie '{title}' already exists in Radarr")
+            if dry_run:
+                return False
+            mark_item_synced(cache, item_key, title, media_type, year, 'radarr')
+            return True
+        if generate_curl:
+            # Generate curl command for manual execution
+            payload = {**_RADARR_PAYLOAD_TEMPLATE, "title": title, "tmdbId": tmdb_id}
+            # Print the whole command at once so parallel items don't interleave
+            report_logger.info("\n".join([
+                f"🔧 [CURL] Movie: {title}",
+                f"curl -X POST '{RADARR_URL}/movie' \\",
+                f"  -H 'X-Api-Key: {RADARR_API_KEY}' \\",
+                f"  -H 'Content-Type: application/json' \\",
+                f"  -H 'Accept: application/json' \\",
+                f"  -d '{orjson.dumps(payload).decode()}'",
+                "",
+            ]))
+            # Mark as synced for curl mode
+            mark_item_synced(cache, item_key, title, media_type, year, 'radarr-curl')
+            return True
+        if dry_run:
+            report_logger.info(f"🔍 [DRY RUN] Would add movie to Radarr: {title} (TMDB: {tmdb_id})")
+            return False
+        return add_to_radarr(tmdb_id, title, cache, item_key, media_type, year)
+    
+    if media_type == "show":
+        tmdb_id = fetch_tmdb_id_cached(title, media_type, cache)
+        if tmdb_id is None:
+            logger.warning(f"⚠️  Could not find TMDB ID for series: {title}")
+            return False
+        if generate_curl:
+            report_logger.info("\n".join([
+                f"🔧 [CURL] TV Show: {title}",
+                f"# First search for the series:",
+                f"curl '{SONARR_URL}/series/lookup?term={quote_plus(title)}' \\",
+                f"  -H 'X-Api-Key: {SONARR_API_KEY}' \\",
+                f"  -H 'Accept: application/json'",
+                f"# Then add using the tvdbId from search results",
+                "",
+            ]))
+            # Mark as synced for curl mode
+            mark_item_synced(cache, item_key, title, media_type, year, 'sonarr-curl')
+            return True
+        if dry_run:
+            report_logger.info(f"🔍 [DRY RUN] Would add series to Sonarr: {title} (TMDB: {tmdb_id})")
+            return False
+        return search_and_add_series(title, cache, item_key, media_type, year)
+    
+    logger.info(f"❓ Unknown media type: {media_type}")
+    return False
+
 def main():
     # Add dry-run mode for testing
     DRY_RUN = os.getenv('DRY_RUN', 'false').lower() == 'true'
@@ -421,155 +637,111 @@ def main():
     # Add timestamp for Docker logging
     timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
     
-    print("=" * 60)
-    print("🎬 PLEX WATCHLIST TO RADARR/SONARR SYNC")
-    print(f"⏰ Started at: {timestamp}")
-    print("=" * 60)
+    logger.info("=" * 60)
+    logger.info("🎬 PLEX WATCHLIST TO RADARR/SONARR SYNC")
+    logger.info(f"⏰ Started at: {timestamp}")
+    logger.info("=" * 60)
+    flush_logs()
     
     # Load sync cache
-    print("📋 Loading sync cache...")
+    logger.info("📋 Loading sync cache...")
     cache = load_sync_cache()
-    cached_count = len(cache['synced_items'])
-    print(f"💾 Found {cached_count} previously synced items")
-    
-    if DRY_RUN:
-        print("🔍 DRY RUN MODE - No items will actually be added")
-        print("-" * 60)
-    elif GENERATE_CURL:
-        print("🔧 CURL GENERATION MODE - Creating manual API commands")
-        print("-" * 60)
-    
-    print("📡 Fetching Plex watchlist...")
-    watchlist = fetch_plex_watchlist()
-    print(f"📋 Found {len(watchlist)} items in Plex watchlist")
-    
-    if not watchlist:
-        print("ℹ️  No items found in watchlist")
-        return
-    
-    # Filter out already synced items
-    new_items = []
-    cached_items = []
-    
-    for item in watchlist:
-        title = item.get('title')
-        media_type = item.get('type')
-        year = item.get('year')
+    try:
+        cached_count = count_synced_items(cache)
+        logger.info(f"💾 Found {cached_count} previously synced items")
         
-        if is_item_synced(cache, title, media_type, year):
-            cached_items.append(title)
-        else:
-            new_items.append(item)
-    
-    print(f"✅ {len(cached_items)} items already synced (skipping)")
-    print(f"🆕 {len(new_items)} new items to process")
-    
-    if len(cached_items) > 0:
-        print(f"📝 Previously synced: {', '.join(cached_items[:5])}" + 
-              (f" and {len(cached_items)-5} more..." if len(cached_items) > 5 else ""))
-    
-    if not new_items:
-        print("🎉 Nothing new to sync!")
-        return
-    
-    movies_count = 0
-    shows_count = 0
-    unknown_count = 0
-    newly_synced = 0
-    
-    print(f"\n🎯 Processing {len(new_items)} new items:")
-    print("-" * 60)
-    
-    for i, item in enumerate(new_items, 1):
-        title = item.get('title')
-        media_type = item.get('type')
-        year = item.get('year', 'Unknown')
+        if DRY_RUN:
+            logger.info("🔍 DRY RUN MODE - No items will actually be added")
+            logger.info("-" * 60)
+        elif GENERATE_CURL:
+            logger.info("🔧 CURL GENERATION MODE - Creating manual API commands")
+            logger.info("-" * 60)
         
-        print(f"\n[{i}/{len(new_items)}] 📺 {title} ({year}) - Type: {media_type}")
+        # Plex can report the watchlist size and newest item cheaply; if both match a run where
+        # everything got synced, skip downloading and parsing the watchlist altogether
+        watchlist_signature = None if FETCH_ALL_USER_WATCHLISTS else fetch_watchlist_signature()
+        if watchlist_signature is not None and watchlist_signature == get_cache_meta(cache, 'synced_watchlist_signature'):
+            logger.info(f"📋 Watchlist unchanged ({watchlist_signature.split('|')[0]} items, all previously synced)")
+            logger.info("🎉 Nothing new to sync!")
+            return
         
-        if media_type == "movie":
-            movies_count += 1
-            tmdb_id = fetch_tmdb_id(title, media_type)
-            if tmdb_id is not None:
-                if GENERATE_CURL:
-                    # Generate curl command for manual execution
-                    payload = {
-                        "title": title,
-                        "qualityProfileId": int(RADARR_QUALITY_PROFILE),
-                        "tmdbId": tmdb_id,
-                        "rootFolderPath": RADARR_ROOT_FOLDER,
-                        "monitored": True,
-                        "addOptions": {"searchForMovie": True}
-                    }
-                    print(f"🔧 [CURL] Movie: {title}")
-                    print(f"curl -X POST '{RADARR_URL}/movie' \\")
-                    print(f"  -H 'X-Api-Key: {RADARR_API_KEY}' \\")
-                    print(f"  -H 'Content-Type: application/json' \\")
-                    print(f"  -H 'Accept: application/json' \\")
-                    print(f"  -d '{json.dumps(payload, separators=(',', ':'))}'")
-                    print()
-                    # Mark as synced for curl mode
-                    mark_item_synced(cache, title, media_type, year, 'radarr-curl')
-                    newly_synced += 1
-                elif not DRY_RUN:
-                    success = add_to_radarr_with_cache(tmdb_id, title, cache, media_type, year)
-                    if success:
-                        newly_synced += 1
-                else:
-                    print(f"🔍 [DRY RUN] Would add movie to Radarr: {title} (TMDB: {tmdb_id})")
-            else:
-                print(f"⚠️  Could not find TMDB ID for movie: {title}")
-                
-        elif media_type == "show":
-            shows_count += 1
-            tmdb_id = fetch_tmdb_id(title, media_type)
-            if tmdb_id is not None:
-                if GENERATE_CURL:
-                    print(f"🔧 [CURL] TV Show: {title}")
-                    print(f"# First search for the series:")
-                    print(f"curl '{SONARR_URL}/series/lookup?term={title.replace(' ', '%20')}' \\")
-                    print(f"  -H 'X-Api-Key: {SONARR_API_KEY}' \\")
-                    print(f"  -H 'Accept: application/json'")
-                    print(f"# Then add using the tvdbId from search results")
-                    print()
-                    # Mark as synced for curl mode
-                    mark_item_synced(cache, title, media_type, year, 'sonarr-curl')
-                    newly_synced += 1
-                elif not DRY_RUN:
-                    success = search_and_add_series_with_cache(title, cache, media_type, year)
-                    if success:
-                        newly_synced += 1
-                else:
-                    print(f"🔍 [DRY RUN] Would add series to Sonarr: {title} (TMDB: {tmdb_id})")
-            else:
-                print(f"⚠️  Could not find TMDB ID for series: {title}")
+        logger.info("📡 Fetching Plex watchlist...")
+        watchlist = fetch_plex_watchlist()
+        logger.info(f"📋 Found {len(watchlist)} items in Plex watchlist")
+        
+        if not watchlist:
+            logger.info("ℹ️  No items found in watchlist")
+            return
+        
+        # Filter out already synced items with one bulk query
+        keyed_items = [(get_item_key(item.get('title'), item.get('type'), item.get('year')), item) for item in watchlist]
+        synced_keys = get_synced_keys(cache, {item_key for item_key, _ in keyed_items})
+        new_items = [(item_key, item) for item_key, item in keyed_items if item_key not in synced_keys]
+        cached_items = [item.get('title') for item_key, item in keyed_items if item_key in synced_keys]
+        
+        logger.info(f"✅ {len(cached_items)} items already synced (skipping)")
+        logger.info(f"🆕 {len(new_items)} new items to process")
+        
+        # Only build the preview when INFO output is actually enabled
+        if cached_items and logger.isEnabledFor(logging.INFO):
+            logger.info("📝 Previously synced: %s%s", ', '.join(cached_items[:5]),
+                        f" and {len(cached_items) - 5} more..." if len(cached_items) > 5 else "")
+        
+        flush_logs()
+        
+        if not new_items:
+            if watchlist_signature is not None:
+                set_cache_meta(cache, 'synced_watchlist_signature', watchlist_signature)
+            logger.info("🎉 Nothing new to sync!")
+            return
+        
+        # One listing per server answers "already added?" for every new item
+        refresh_cache_from_servers(cache)
+        
+        movies_count = sum(1 for _, item in new_items if item.get('type') == "movie")
+        shows_count = sum(1 for _, item in new_items if item.get('type') == "show")
+        unknown_count = len(new_items) - movies_count - shows_count
+        
+        logger.info(f"\n🎯 Processing {len(new_items)} new items ({MAX_WORKERS} in parallel):")
+        logger.info("-" * 60)
+        
+        # Items are independent network round-trips, so run them concurrently
+        with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+            futures = [
+                executor.submit(process_item, i, len(new_items), item_key, item, cache, DRY_RUN, GENERATE_CURL)
+                for i, (item_key, item) in enumerate(new_items, 1)
+            ]
+            newly_synced = sum(1 for future in as_completed(futures) if future.result())
+        
+        # Only remember the signature once every item made it, so failures are retried next run
+        if watchlist_signature is not None and newly_synced == len(new_items):
+            set_cache_meta(cache, 'synced_watchlist_signature', watchlist_signature)
+        
+        logger.info("\n" + "=" * 60)
+        logger.info("📊 SUMMARY")
+        logger.info("=" * 60)
+        logger.info(f"🎬 New movies processed: {movies_count}")
+        logger.info(f"📺 New TV shows processed: {shows_count}")
+        logger.info(f"❓ Unknown types: {unknown_count}")
+        logger.info(f"🆕 Items newly synced: {newly_synced}")
+        logger.info(f"💾 Total cached items: {count_synced_items(cache)}")
+        logger.info(f"📋 Total watchlist items: {len(watchlist) if 'watchlist' in locals() else len(new_items) + len(cached_items)}")
+        
+        if DRY_RUN:
+            logger.info("\n💡 To actually add items, run without DRY_RUN=true")
+            logger.info("🔧 To generate manual curl commands, run with GENERATE_CURL=true")
+        elif GENERATE_CURL:
+            logger.info("\n💡 Copy and paste the curl commands above to manually add items")
+            logger.info("🔧 Test individual commands first to verify authentication")
+        elif newly_synced > 0:
+            logger.info(f"\n🎉 Successfully synced {newly_synced} new items!")
         else:
-            unknown_count += 1
-            print(f"❓ Unknown media type: {media_type}")
-    
-    # Save updated cache
-    save_sync_cache(cache)
-    
-    print("\n" + "=" * 60)
-    print("📊 SUMMARY")
-    print("=" * 60)
-    print(f"🎬 New movies processed: {movies_count}")
-    print(f"📺 New TV shows processed: {shows_count}")
-    print(f"❓ Unknown types: {unknown_count}")
-    print(f"🆕 Items newly synced: {newly_synced}")
-    print(f"💾 Total cached items: {len(cache['synced_items'])}")
-    print(f"📋 Total watchlist items: {len(watchlist) if 'watchlist' in locals() else len(new_items) + len(cached_items)}")
-    
-    if DRY_RUN:
-        print("\n💡 To actually add items, run without DRY_RUN=true")
-        print("🔧 To generate manual curl commands, run with GENERATE_CURL=true")
-    elif GENERATE_CURL:
-        print("\n💡 Copy and paste the curl commands above to manually add items")
-        print("🔧 Test individual commands first to verify authentication")
-    elif newly_synced > 0:
-        print(f"\n🎉 Successfully synced {newly_synced} new items!")
-    else:
-        print("\n✨ All watchlist items already synced - nothing to do!")
+            logger.info("\n✨ All watchlist items already synced - nothing to do!")
+    finally:
+        close_sync_cache(cache)
 
 if __name__ == "__main__":
-    main()
+    try:
+        main()
+    finally:
+        flush_logs()